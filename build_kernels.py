@@ -0,0 +1,27 @@
+"""Ahead-of-time compile the indicator kernel into the ``indicator_kernels`` extension.
+
+Run once after installing the requirements:
+
+    python build_kernels.py
+
+enhanced_main.py imports the compiled module when it is present and falls
+back to JIT-compiling the same kernel otherwise.
+"""
+from numba import njit
+from numba.pycc import CC
+
+from kernels import compute_indicators
+
+cc = CC('indicator_kernels')
+
+_kernel = njit(compute_indicators)
+
+
+@cc.export('compute_indicators', 'UniTuple(f8, 11)(f8[::1], f8[::1])')
+def compute_indicators_default(close, volume):
+    """Default-parameter kernel: SMA20/50, RSI14, BB(20, 2) over INDICATOR_WINDOW bars"""
+    return _kernel(close, volume)
+
+
+if __name__ == '__main__':
+    cc.compile()
@@ -1,16 +1,54 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, timedelta
-import requests
+from datetime import datetime
 import time
+import copy
 import threading
-from dataclasses import dataclass
-from typing import Dict, List, Optional
-import json
+from collections import deque
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional
+import logging
+from kernels import INDICATOR_WINDOW, compute_indicators as _compute_indicators_py
+
+logger = logging.getLogger(__name__)
+
+# On-disk copy of the fetched history so cold restarts only download recent bars
+HISTORY_CACHE_DIR = Path("cache")
+HISTORY_CACHE_MAX_AGE = 3 * 24 * 3600  # seconds
+
+# Display names for forex and crypto pairs
+_SYMBOL_ALIASES = {
+    'EURUSD=X': 'EUR/USD',
+    'GBPUSD=X': 'GBP/USD',
+    'USDJPY=X': 'USD/JPY',
+    'AUDUSD=X': 'AUD/USD',
+    'USDCAD=X': 'USD/CAD',
+    'BTC-USD': 'BTC/USDT',
+    'ETH-USD': 'ETH/USDT',
+    'BNB-USD': 'BNB/USDT',
+    'ADA-USD': 'ADA/USDT',
+    'SOL-USD': 'SOL/USDT'
+}
+
+# Recommended contract period per timeframe for strong / weak signals
+_CONTRACT_PERIODS_STRONG = {
+    '1m': '15 minutes',
+    '5m': '1 hour',
+    '15m': '4 hours',
+    '1h': '1 day',
+    '4h': '3 days',
+    '1d': '1 week'
+}
+_CONTRACT_PERIODS_WEAK = {
+    '1m': '5 minutes',
+    '5m': '30 minutes',
+    '15m': '2 hours',
+    '1h': '8 hours',
+    '4h': '1 day',
+    '1d': '3 days'
+}
 
 # Configure Streamlit page
 st.set_page_config(
@@ -20,34 +58,318 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+def _ema(x: np.ndarray, span: int) -> np.ndarray:
+    """EMA series (pandas adjust=False) along the last axis, seeded at the first sample"""
+    # scipy is only needed off the numba path; importing it costs ~1 s on cold start
+    from scipy.signal import lfilter
+    alpha = 2.0 / (span + 1)
+    y, _ = lfilter([alpha], [1.0, alpha - 1.0], x, axis=-1, zi=(1.0 - alpha) * x[..., :1])
+    return y
+
+def _wilder_last(x: np.ndarray, n: int):
+    """Last Wilder average along the last axis, seeded with the mean of the first n values"""
+    from scipy.signal import lfilter
+    seed = x[..., :n].mean(axis=-1)
+    if x.shape[-1] == n:
+        return seed
+    decay = (n - 1) / n
+    y, _ = lfilter([1.0 / n], [1.0, -decay], x[..., n:], axis=-1, zi=decay * seed[..., None])
+    return y[..., -1]
+
+def _batch_indicators(closes: np.ndarray, volumes: np.ndarray, sma20_n=20, sma50_n=50, rsi_n=14, bb_n=20) -> tuple:
+    """_compute_indicators over a (symbols, bars) matrix; every output is a (symbols,) array"""
+    n_symbols, n_bars = closes.shape
+    nan = np.full(n_symbols, np.nan)
+    
+    ema12 = _ema(closes, 12)
+    ema26 = _ema(closes, 26)
+    macd_signal = _ema(ema12 - ema26, 9)[:, -1]
+    
+    sma20 = closes[:, -sma20_n:].mean(axis=1) if n_bars >= sma20_n else nan
+    sma50 = closes[:, -sma50_n:].mean(axis=1) if n_bars >= sma50_n else nan
+    volume_avg = volumes[:, -sma20_n:].mean(axis=1) if n_bars >= sma20_n else nan
+    
+    bb_middle = bb_upper = bb_lower = nan
+    if n_bars >= bb_n and bb_n > 1:
+        window = closes[:, -bb_n:]
+        bb_middle = window.mean(axis=1)
+        bb_std = window.std(axis=1, ddof=1)
+        bb_upper = bb_middle + 2.0 * bb_std
+        bb_lower = bb_middle - 2.0 * bb_std
+    
+    rsi = nan
+    delta = np.diff(closes, axis=1)
+    if delta.shape[1] >= rsi_n:
+        avg_gain = _wilder_last(np.maximum(delta, 0.0), rsi_n)
+        avg_loss = _wilder_last(np.maximum(-delta, 0.0), rsi_n)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+    
+    return (sma20, sma50, ema12[:, -1], ema26[:, -1], macd_signal, rsi,
+            bb_middle, bb_upper, bb_lower, volume_avg, volumes[:, -1])
+
+def _compute_indicators_scipy(close, volume, sma20_n=20, sma50_n=50, rsi_n=14, bb_n=20,
+                              window=INDICATOR_WINDOW):
+    """NumPy/SciPy implementation of _compute_indicators for installs without numba"""
+    n = close.shape[0]
+    if n == 0:
+        return (np.nan,) * 11
+    tail = close[-max(sma50_n + 1, window):]
+    
+    ema12 = _ema(tail, 12)
+    ema26 = _ema(tail, 26)
+    macd = ema12 - ema26
+    macd_signal = _ema(macd, 9)[-1] if macd.size > 1 else 0.0
+    
+    sma20 = tail[-sma20_n:].mean() if n >= sma20_n else np.nan
+    sma50 = tail[-sma50_n:].mean() if n >= sma50_n else np.nan
+    volume_avg = volume[-sma20_n:].mean() if n >= sma20_n else np.nan
+    
+    bb_middle = bb_upper = bb_lower = np.nan
+    if n >= bb_n and bb_n > 1:
+        bb_middle = tail[-bb_n:].mean()
+        bb_std = tail[-bb_n:].std(ddof=1)
+        bb_upper = bb_middle + 2.0 * bb_std
+        bb_lower = bb_middle - 2.0 * bb_std
+    
+    # Wilder RSI, seeded with the simple average of the first deltas
+    rsi = np.nan
+    delta = np.diff(tail)
+    if delta.size >= rsi_n:
+        gain = np.maximum(delta, 0.0)
+        loss = np.maximum(-delta, 0.0)
+        avg_gain = _wilder_last(gain, rsi_n)
+        avg_loss = _wilder_last(loss, rsi_n)
+        rsi = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    
+    return (sma20, sma50, ema12[-1], ema26[-1], macd_signal, rsi,
+            bb_middle, bb_upper, bb_lower, volume_avg, volume[-1])
+
+try:
+    # Ahead-of-time build from build_kernels.py: no JIT stall on a cold start
+    from indicator_kernels import compute_indicators as _compute_indicators
+except ImportError:
+    try:
+        # numba is only needed without the ahead-of-time build
+        from numba import njit
+    except ImportError:
+        _compute_indicators = _compute_indicators_scipy
+    else:
+        # All fastmath flags except 'nnan'/'ninf': the kernel returns NaN for
+        # indicators that do not have enough history yet.
+        # Compiled on first use: the app streams indicators through IndicatorState,
+        # so only calculate_indicators callers outside the data manager need it
+        _compute_indicators = njit(cache=True, nogil=True,
+                                   fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'})(_compute_indicators_py)
+
 @dataclass
 class StructuredTradingSignal:
     signal: str  # 'BUY', 'SELL', 'HOLD'
     asset: str
     timeframe: str
     contract_period: str
-    entry_zone: str
-    target: str
-    stop_loss: str
+    entry_low: float
+    entry_high: float
+    target_price: float
+    stop_loss_price: float
     confidence: int
     reasoning: str
     timestamp: datetime
 
+class EntryExitZones(NamedTuple):
+    entry_low: float
+    entry_high: float
+    target: float
+    stop_loss: float
+
+@dataclass
+class IndicatorState:
+    """Running indicator state for one symbol, updated bar by bar"""
+    last_timestamp: Optional[pd.Timestamp] = None
+    closes20: deque = field(default_factory=lambda: deque(maxlen=20))
+    closes50: deque = field(default_factory=lambda: deque(maxlen=50))
+    volumes20: deque = field(default_factory=lambda: deque(maxlen=20))
+    sum20: float = 0.0
+    sum50: float = 0.0
+    bb_sumsq: float = 0.0
+    volume_sum: float = 0.0
+    ema12: float = np.nan
+    ema26: float = np.nan
+    macd_signal: float = np.nan
+    avg_gain: float = 0.0
+    avg_loss: float = 0.0
+    n_deltas: int = 0
+    last_close: float = np.nan
+
+def update_indicators(state: IndicatorState, new_closes, new_volumes, rsi_n: int = 14):
+    """Ingest new bars into the running state in O(1) per bar"""
+    alpha12 = 2.0 / 13.0
+    alpha26 = 2.0 / 27.0
+    alpha9 = 2.0 / 10.0
+    
+    for x, vol in zip(new_closes, new_volumes):
+        x = float(x)
+        vol = float(vol)
+        
+        # SMA / Bollinger sums: drop the evicted value, add the new one
+        if len(state.closes20) == state.closes20.maxlen:
+            old = state.closes20[0]
+            state.sum20 -= old
+            state.bb_sumsq -= old * old
+            state.volume_sum -= state.volumes20[0]
+        if len(state.closes50) == state.closes50.maxlen:
+            state.sum50 -= state.closes50[0]
+        state.closes20.append(x)
+        state.closes50.append(x)
+        state.volumes20.append(vol)
+        state.sum20 += x
+        state.sum50 += x
+        state.bb_sumsq += x * x
+        state.volume_sum += vol
+        
+        if np.isnan(state.last_close):
+            state.ema12 = x
+            state.ema26 = x
+            state.macd_signal = 0.0
+        else:
+            state.ema12 = alpha12 * x + (1 - alpha12) * state.ema12
+            state.ema26 = alpha26 * x + (1 - alpha26) * state.ema26
+            state.macd_signal = alpha9 * (state.ema12 - state.ema26) + (1 - alpha9) * state.macd_signal
+            
+            # Wilder RSI, seeded with the simple average of the first deltas
+            delta = x - state.last_close
+            gain = max(delta, 0.0)
+            loss = max(-delta, 0.0)
+            state.n_deltas += 1
+            if state.n_deltas <= rsi_n:
+                state.avg_gain += (gain - state.avg_gain) / state.n_deltas
+                state.avg_loss += (loss - state.avg_loss) / state.n_deltas
+            else:
+                state.avg_gain = (state.avg_gain * (rsi_n - 1) + gain) / rsi_n
+                state.avg_loss = (state.avg_loss * (rsi_n - 1) + loss) / rsi_n
+        
+        state.last_close = x
+
+def state_values(state: IndicatorState, rsi_n: int = 14) -> tuple:
+    """Read the state back in the same layout as _compute_indicators"""
+    n20 = len(state.closes20)
+    sma20 = bb_middle = bb_upper = bb_lower = volume_avg = np.nan
+    sma50 = np.nan
+    rsi = np.nan
+    if n20 == state.closes20.maxlen:
+        sma20 = state.sum20 / n20
+        volume_avg = state.volume_sum / n20
+        variance = max(state.bb_sumsq - n20 * sma20 * sma20, 0.0) / (n20 - 1)
+        bb_std = np.sqrt(variance)
+        bb_middle = sma20
+        bb_upper = sma20 + 2 * bb_std
+        bb_lower = sma20 - 2 * bb_std
+    if len(state.closes50) == state.closes50.maxlen:
+        sma50 = state.sum50 / len(state.closes50)
+    if state.n_deltas >= rsi_n:
+        if state.avg_loss == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - 100 / (1 + state.avg_gain / state.avg_loss)
+    volume_current = state.volumes20[-1] if state.volumes20 else np.nan
+    
+    return (sma20, sma50, state.ema12, state.ema26, state.macd_signal, rsi,
+            bb_middle, bb_upper, bb_lower, volume_avg, volume_current)
+
+def build_indicators(values: tuple) -> Dict:
+    """Build the indicator dict from _compute_indicators/state_values output"""
+    (sma_20, sma_50, ema_12, ema_26, macd_signal, rsi,
+     bb_middle, bb_upper, bb_lower,
+     volume_avg, volume_current) = values
+    indicators = {}
+    
+    # Moving Averages
+    indicators['sma_20'] = sma_20
+    indicators['sma_50'] = sma_50
+    indicators['ema_12'] = ema_12
+    indicators['ema_26'] = ema_26
+    
+    # RSI
+    indicators['rsi'] = rsi
+    
+    # MACD
+    indicators['macd'] = indicators['ema_12'] - indicators['ema_26']
+    indicators['macd_signal'] = macd_signal
+    indicators['macd_histogram'] = indicators['macd'] - indicators['macd_signal']
+    
+    # Bollinger Bands
+    indicators['bb_upper'] = bb_upper
+    indicators['bb_lower'] = bb_lower
+    indicators['bb_middle'] = bb_middle
+    
+    # Volume analysis
+    indicators['volume_avg'] = volume_avg
+    indicators['volume_current'] = volume_current
+    
+    return indicators
+
 class EnhancedTradingEngine:
     """Enhanced trading engine with structured signal format"""
     
+    # Signal factors scored by analyze_signal_strength, in mask order
+    _FACTOR_NAMES = (
+        'RSI oversold', 'RSI overbought',
+        'MACD bullish', 'MACD bearish',
+        'Price above MAs', 'Price below MAs',
+        'Near lower BB', 'Near upper BB',
+        'Strong volume',
+    )
+    _WEIGHTS = np.array([+1, -1, +0.5, -0.5, +0.5, -0.5, +0.3, -0.3, 0], dtype=np.float64)
+    
+    # Bit i of 'factor_mask' is set when _FACTOR_NAMES[i] applies
+    _FACTOR_BITS = 1 << np.arange(len(_FACTOR_NAMES), dtype=np.int64)
+    STRONG_VOLUME_BIT = 1 << _FACTOR_NAMES.index('Strong volume')
+    
     def __init__(self):
-        self.signals_history = []
+        self.signals_history = deque(maxlen=500)
         
     def generate_structured_signal(self, symbol: str, market_data: Dict, timeframe: str = '15m') -> StructuredTradingSignal:
         """Generate structured trading signals in the specified format"""
         
-        # Calculate technical indicators
-        indicators = self.calculate_indicators(market_data['hist'])
+        # Use streamed indicators when the data manager provides them
+        if 'indicators' in market_data:
+            indicators = market_data['indicators']
+        else:
+            indicators = self.calculate_indicators(market_data['hist'])
         
         # Analyze signal
         signal_analysis = self.analyze_signal_strength(indicators, market_data['current_price'])
         
+        return self.build_structured_signal(symbol, market_data, indicators, signal_analysis, timeframe)
+    
+    def generate_structured_signals(self, batch: Dict[str, Dict], timeframe: str = '15m') -> Dict[str, StructuredTradingSignal]:
+        """Generate structured signals for several symbols with one vectorized scoring pass"""
+        symbols = list(batch)
+        if not symbols:
+            return {}
+        
+        # Streamed indicators are reused; the rest are computed together
+        rows = [batch[symbol].get('indicators') for symbol in symbols]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        if missing:
+            computed = self.calculate_indicators_batch([batch[symbols[i]]['hist'] for i in missing])
+            for j, i in enumerate(missing):
+                rows[i] = {key: values[j] for key, values in computed.items()}
+        
+        # Structure-of-arrays view: one (N,) array per indicator
+        indicators = {key: np.array([row[key] for row in rows], dtype=np.float64) for key in rows[0]}
+        prices = np.array([batch[symbol]['current_price'] for symbol in symbols], dtype=np.float64)
+        analyses = self.analyze_signal_strength_batch(indicators, prices)
+        
+        return {
+            symbol: self.build_structured_signal(symbol, batch[symbol], rows[i], analyses[i], timeframe)
+            for i, symbol in enumerate(symbols)
+        }
+    
+    def build_structured_signal(self, symbol: str, market_data: Dict, indicators: Dict,
+                                signal_analysis: Dict, timeframe: str) -> StructuredTradingSignal:
+        """Assemble the structured signal from an analyzed symbol"""
+        
         # Calculate confidence dynamically
         confidence = self.calculate_dynamic_confidence(signal_analysis, indicators)
         
@@ -68,9 +390,10 @@ class EnhancedTradingEngine:
             asset=formatted_asset,
             timeframe=timeframe,
             contract_period=contract_period,
-            entry_zone=zones['entry'],
-            target=zones['target'],
-            stop_loss=zones['stop_loss'],
+            entry_low=zones.entry_low,
+            entry_high=zones.entry_high,
+            target_price=zones.target,
+            stop_loss_price=zones.stop_loss,
             confidence=confidence,
             reasoning=reasoning,
             timestamp=datetime.now()
@@ -78,81 +401,62 @@ class EnhancedTradingEngine:
     
     def calculate_indicators(self, hist_data: pd.DataFrame) -> Dict:
         """Calculate technical indicators"""
-        indicators = {}
-        
-        # Moving Averages
-        indicators['sma_20'] = hist_data['Close'].rolling(window=20).mean().iloc[-1]
-        indicators['sma_50'] = hist_data['Close'].rolling(window=50).mean().iloc[-1]
-        indicators['ema_12'] = hist_data['Close'].ewm(span=12).mean().iloc[-1]
-        indicators['ema_26'] = hist_data['Close'].ewm(span=26).mean().iloc[-1]
-        
-        # RSI
-        delta = hist_data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        indicators['rsi'] = 100 - (100 / (1 + rs)).iloc[-1]
-        
-        # MACD
-        indicators['macd'] = indicators['ema_12'] - indicators['ema_26']
-        indicators['macd_signal'] = pd.Series([indicators['macd']]).ewm(span=9).mean().iloc[0]
-        indicators['macd_histogram'] = indicators['macd'] - indicators['macd_signal']
-        
-        # Bollinger Bands
-        bb_period = 20
-        bb_std = 2
-        sma = hist_data['Close'].rolling(window=bb_period).mean()
-        std = hist_data['Close'].rolling(window=bb_period).std()
-        indicators['bb_upper'] = (sma + (std * bb_std)).iloc[-1]
-        indicators['bb_lower'] = (sma - (std * bb_std)).iloc[-1]
-        indicators['bb_middle'] = sma.iloc[-1]
-        
-        # Volume analysis
-        indicators['volume_avg'] = hist_data['Volume'].rolling(window=20).mean().iloc[-1]
-        indicators['volume_current'] = hist_data['Volume'].iloc[-1]
-        
-        return indicators
+        # One zero-copy conversion per column; the kernels take C-contiguous float64
+        tail = hist_data.tail(INDICATOR_WINDOW)
+        close = np.ascontiguousarray(tail['Close'].to_numpy(dtype=np.float64, copy=False))
+        volume = np.ascontiguousarray(tail['Volume'].to_numpy(dtype=np.float64, copy=False))
+        return build_indicators(_compute_indicators(close, volume))
+    
+    def calculate_indicators_batch(self, hists: List[pd.DataFrame]) -> Dict[str, np.ndarray]:
+        """Calculate technical indicators for several histories as (N,) arrays"""
+        # Only reached for market data without streamed indicators, i.e. dicts
+        # built outside EnhancedDataManager
+        # Each history keeps its own window; equal lengths are stacked together
+        windows = np.array([min(INDICATOR_WINDOW, len(hist)) for hist in hists])
+        values = [np.empty(len(hists)) for _ in range(11)]
+        for window in np.unique(windows):
+            rows = np.flatnonzero(windows == window)
+            closes = np.stack([hists[i]['Close'].to_numpy(dtype=np.float64)[-window:] for i in rows])
+            volumes = np.stack([hists[i]['Volume'].to_numpy(dtype=np.float64)[-window:] for i in rows])
+            for out, group in zip(values, _batch_indicators(closes, volumes)):
+                out[rows] = group
+        return build_indicators(tuple(values))
+    
+    def signal_mask(self, indicators: Dict, current_price) -> np.ndarray:
+        """Evaluate the scored conditions; works on scalars or (N,) arrays"""
+        rsi = np.asarray(indicators['rsi'])
+        macd_bullish = np.asarray(indicators['macd_histogram']) > 0
+        sma_20 = np.asarray(indicators['sma_20'])
+        sma_50 = np.asarray(indicators['sma_50'])
+        price = np.asarray(current_price)
+        
+        return np.stack([
+            rsi < 30,                                   # RSI signals
+            rsi > 70,
+            macd_bullish,                               # MACD signals
+            ~macd_bullish,
+            (price > sma_20) & (sma_20 > sma_50),       # Moving Average signals
+            (price < sma_20) & (sma_20 < sma_50),
+            price < np.asarray(indicators['bb_lower']), # Bollinger Bands
+            price > np.asarray(indicators['bb_upper']),
+            np.asarray(indicators['volume_current']) > np.asarray(indicators['volume_avg']) * 1.2,  # Volume confirmation
+        ], axis=-1)
     
     def analyze_signal_strength(self, indicators: Dict, current_price: float) -> Dict:
         """Analyze signal strength and type"""
-        signal_strength = 0
-        signal_factors = []
-        
-        # RSI signals
-        if indicators['rsi'] < 30:
-            signal_strength += 1
-            signal_factors.append('RSI oversold')
-        elif indicators['rsi'] > 70:
-            signal_strength -= 1
-            signal_factors.append('RSI overbought')
-        
-        # MACD signals
-        if indicators['macd_histogram'] > 0:
-            signal_strength += 0.5
-            signal_factors.append('MACD bullish')
-        else:
-            signal_strength -= 0.5
-            signal_factors.append('MACD bearish')
-        
-        # Moving Average signals
-        if current_price > indicators['sma_20'] > indicators['sma_50']:
-            signal_strength += 0.5
-            signal_factors.append('Price above MAs')
-        elif current_price < indicators['sma_20'] < indicators['sma_50']:
-            signal_strength -= 0.5
-            signal_factors.append('Price below MAs')
-        
-        # Bollinger Bands
-        if current_price < indicators['bb_lower']:
-            signal_strength += 0.3
-            signal_factors.append('Near lower BB')
-        elif current_price > indicators['bb_upper']:
-            signal_strength -= 0.3
-            signal_factors.append('Near upper BB')
-        
-        # Volume confirmation
-        if indicators['volume_current'] > indicators['volume_avg'] * 1.2:
-            signal_factors.append('Strong volume')
+        mask = self.signal_mask(indicators, current_price)
+        return self.summarize_signal(float(mask @ self._WEIGHTS), mask)
+    
+    def analyze_signal_strength_batch(self, indicators: Dict[str, np.ndarray], prices: np.ndarray) -> List[Dict]:
+        """Analyze signal strength for N symbols at once"""
+        mask = self.signal_mask(indicators, prices)
+        strengths = mask @ self._WEIGHTS
+        return [self.summarize_signal(float(strength), row) for strength, row in zip(strengths, mask)]
+    
+    def summarize_signal(self, signal_strength: float, mask: np.ndarray) -> Dict:
+        """Turn a weighted strength and its factor mask into the signal analysis dict"""
+        signal_factors = [name for name, hit in zip(self._FACTOR_NAMES, mask) if hit]
+        factor_mask = int(mask @ self._FACTOR_BITS)
         
         # Determine signal type
         if signal_strength > 0.5:
@@ -166,6 +470,7 @@ class EnhancedTradingEngine:
             'type': signal_type,
             'strength': abs(signal_strength),
             'factors': signal_factors,
+            'factor_mask': factor_mask,
             'raw_strength': signal_strength
         }
     
@@ -191,32 +496,27 @@ class EnhancedTradingEngine:
         final_confidence = base_confidence + confidence_adjustment
         return min(95, max(10, int(final_confidence)))
     
-    def calculate_entry_exit_zones(self, current_price: float, signal_analysis: Dict, indicators: Dict) -> Dict:
+    def calculate_entry_exit_zones(self, current_price: float, signal_analysis: Dict, indicators: Dict) -> EntryExitZones:
         """Calculate entry zone, target, and stop loss"""
         volatility = abs(indicators['bb_upper'] - indicators['bb_lower']) / current_price
         
         if signal_analysis['type'] == 'BUY':
             entry_low = current_price * (1 - volatility * 0.5)
             entry_high = current_price * (1 + volatility * 0.2)
-            entry_zone = f"{entry_low:.2f} – {entry_high:.2f}"
-            target = f"{current_price * (1 + volatility * 2):.2f}"
-            stop_loss = f"{current_price * (1 - volatility * 1.5):.2f}"
+            target = current_price * (1 + volatility * 2)
+            stop_loss = current_price * (1 - volatility * 1.5)
         elif signal_analysis['type'] == 'SELL':
             entry_low = current_price * (1 - volatility * 0.2)
             entry_high = current_price * (1 + volatility * 0.5)
-            entry_zone = f"{entry_low:.2f} – {entry_high:.2f}"
-            target = f"{current_price * (1 - volatility * 2):.2f}"
-            stop_loss = f"{current_price * (1 + volatility * 1.5):.2f}"
+            target = current_price * (1 - volatility * 2)
+            stop_loss = current_price * (1 + volatility * 1.5)
         else:
-            entry_zone = f"{current_price * 0.995:.2f} – {current_price * 1.005:.2f}"
-            target = f"{current_price:.2f}"
-            stop_loss = f"{current_price:.2f}"
+            entry_low = current_price * 0.995
+            entry_high = current_price * 1.005
+            target = current_price
+            stop_loss = current_price
         
-        return {
-            'entry': entry_zone,
-            'target': target,
-            'stop_loss': stop_loss
-        }
+        return EntryExitZones(float(entry_low), float(entry_high), float(target), float(stop_loss))
     
     def generate_reasoning(self, signal_analysis: Dict, indicators: Dict) -> str:
         """Generate reasoning for the signal"""
@@ -227,14 +527,14 @@ class EnhancedTradingEngine:
                 reasons.append('RSI indicates oversold conditions')
             if indicators['macd_histogram'] > 0:
                 reasons.append('MACD showing bullish momentum')
-            if 'Strong volume' in signal_analysis['factors']:
+            if signal_analysis['factor_mask'] & self.STRONG_VOLUME_BIT:
                 reasons.append('Strong volume confirmation')
         elif signal_analysis['type'] == 'SELL':
             if indicators['rsi'] > 65:
                 reasons.append('RSI indicates overbought conditions')
             if indicators['macd_histogram'] < 0:
                 reasons.append('MACD showing bearish momentum')
-            if 'Strong volume' in signal_analysis['factors']:
+            if signal_analysis['factor_mask'] & self.STRONG_VOLUME_BIT:
                 reasons.append('Strong volume confirmation')
         else:
             reasons.append('Mixed signals suggest sideways movement')
@@ -243,34 +543,11 @@ class EnhancedTradingEngine:
     
     def format_asset_symbol(self, symbol: str) -> str:
         """Format symbol for display"""
-        forex_pairs = {
-            'EURUSD=X': 'EUR/USD',
-            'GBPUSD=X': 'GBP/USD',
-            'USDJPY=X': 'USD/JPY',
-            'AUDUSD=X': 'AUD/USD',
-            'USDCAD=X': 'USD/CAD'
-        }
-        
-        crypto_pairs = {
-            'BTC-USD': 'BTC/USDT',
-            'ETH-USD': 'ETH/USDT',
-            'BNB-USD': 'BNB/USDT',
-            'ADA-USD': 'ADA/USDT',
-            'SOL-USD': 'SOL/USDT'
-        }
-        
-        return forex_pairs.get(symbol) or crypto_pairs.get(symbol) or symbol
+        return _SYMBOL_ALIASES.get(symbol, symbol)
     
     def get_contract_period(self, timeframe: str, strength: float) -> str:
         """Get recommended contract period"""
-        periods = {
-            '1m': '15 minutes' if strength > 0.7 else '5 minutes',
-            '5m': '1 hour' if strength > 0.7 else '30 minutes',
-            '15m': '4 hours' if strength > 0.7 else '2 hours',
-            '1h': '1 day' if strength > 0.7 else '8 hours',
-            '4h': '3 days' if strength > 0.7 else '1 day',
-            '1d': '1 week' if strength > 0.7 else '3 days'
-        }
+        periods = _CONTRACT_PERIODS_STRONG if strength > 0.7 else _CONTRACT_PERIODS_WEAK
         return periods.get(timeframe, '2 hours')
 
 class EnhancedDataManager:
@@ -280,6 +557,9 @@ class EnhancedDataManager:
         self.cache = {}
         self.last_update = {}
         self.update_interval = 30
+        self.state: Dict[str, IndicatorState] = {}
+        # Shared across sessions by st.cache_resource; guards cache, state and the parquet files
+        self._lock = threading.Lock()
     
     def get_available_symbols(self):
         return {
@@ -288,50 +568,252 @@ class EnhancedDataManager:
             'crypto': ["BTC-USD", "ETH-USD", "BNB-USD", "ADA-USD", "SOL-USD"]
         }
     
+    @st.cache_data(ttl=30, show_spinner=False, hash_funcs={f"{__name__}.EnhancedDataManager": id})
     def get_market_data(self, symbol: str) -> Optional[Dict]:
         """Fetch market data for symbol"""
+        import yfinance as yf
+        
         try:
             ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="3mo", interval="1d")
+            
+            hist = None
+            cached = self.load_history(symbol)
+            if cached is not None:
+                # Only the last few bars can have changed since the previous refresh
+                recent = self.normalize_history(ticker.history(period="5d", interval="1d", auto_adjust=True))
+                hist = self.splice_history(symbol, cached, recent)
+            if hist is None:
+                hist = self.normalize_history(ticker.history(period="3mo", interval="1d", auto_adjust=True))
             
             if hist.empty:
                 return None
             
-            current_price = hist['Close'].iloc[-1]
-            volume = hist['Volume'].iloc[-1]
-            change_percent = ((current_price - hist['Close'].iloc[-2]) / hist['Close'].iloc[-2]) * 100
-            
-            return {
-                'symbol': symbol,
-                'current_price': current_price,
-                'volume': volume,
-                'change_percent': change_percent,
-                'hist': hist,
-                'timestamp': datetime.now()
-            }
+            return self.build_market_data(symbol, hist)
         except Exception as e:
-            st.error(f"Error fetching data for {symbol}: {str(e)}")
+            logger.warning("fetch failed %s: %s", symbol, e)
+            return None
+    
+    @st.cache_data(ttl=30, show_spinner=False, hash_funcs={f"{__name__}.EnhancedDataManager": id})
+    def get_market_data_batch(self, symbols: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch market data for several symbols with one download per period"""
+        import yfinance as yf
+        
+        results = {}
+        
+        # Symbols with a cached history only need the last few bars
+        recent_symbols = [s for s in symbols if self.load_history(s) is not None]
+        full_symbols = [s for s in symbols if s not in recent_symbols]
+        
+        # The 5d pass runs first and appends symbols whose cached history no
+        # longer overlaps the recent bars to full_symbols
+        for period, group in (("5d", recent_symbols), ("3mo", full_symbols)):
+            if not group:
+                continue
+            try:
+                data = yf.download(tickers=group, period=period, interval="1d", group_by='ticker',
+                                   threads=True, progress=False, auto_adjust=True)
+            except Exception as e:
+                logger.warning("batch fetch failed %s: %s", ', '.join(group), e)
+                results.update(dict.fromkeys(group))
+                continue
+            
+            for symbol in group:
+                try:
+                    if isinstance(data.columns, pd.MultiIndex):
+                        if symbol in data.columns.get_level_values(0):
+                            hist = data[symbol]
+                        elif period == "5d":
+                            # No recent bars: keep serving the cached history, as get_market_data does
+                            hist = pd.DataFrame(columns=['Close'])
+                        else:
+                            results[symbol] = None
+                            continue
+                    else:
+                        hist = data
+                    # Mixed asset classes have different trading days
+                    hist = self.normalize_history(hist.dropna(subset=['Close']))
+                    
+                    if period == "5d":
+                        spliced = self.splice_history(symbol, self.load_history(symbol), hist)
+                        if spliced is None:
+                            full_symbols.append(symbol)
+                            continue
+                        hist = spliced
+                    results[symbol] = self.build_market_data(symbol, hist) if not hist.empty else None
+                except Exception as e:
+                    logger.warning("fetch failed %s: %s", symbol, e)
+                    results[symbol] = None
+        
+        return results
+    
+    def build_market_data(self, symbol: str, hist: pd.DataFrame) -> Optional[Dict]:
+        """Cache the history, advance indicator state and summarize the last bars"""
+        if len(hist) < 2:
             return None
+        
+        with self._lock:
+            self.cache[symbol] = hist
+            self.save_history(symbol, hist)
+            indicators = self.update_state(symbol, hist)
+        
+        prev_close, current_price = hist['Close'].values[-2:]
+        volume = hist['Volume'].values[-1]
+        change_percent = ((current_price - prev_close) / prev_close) * 100
+        
+        return {
+            'symbol': symbol,
+            'current_price': current_price,
+            'volume': volume,
+            'change_percent': change_percent,
+            'hist': hist,
+            'indicators': indicators,
+            'timestamp': datetime.now()
+        }
+    
+    def load_history(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Return the cached history, warming it from disk after a restart"""
+        with self._lock:
+            if symbol in self.cache:
+                return self.cache[symbol]
+            
+            path = HISTORY_CACHE_DIR / f"{symbol}.parquet"
+            try:
+                if time.time() - path.stat().st_mtime > HISTORY_CACHE_MAX_AGE:
+                    return None
+                hist = self.normalize_history(pd.read_parquet(path))
+            except (OSError, ImportError, ValueError):
+                return None
+            
+            self.cache[symbol] = hist
+            return hist
+    
+    @staticmethod
+    def normalize_history(hist: pd.DataFrame) -> pd.DataFrame:
+        """Drop the index timezone so Ticker.history and yf.download bars compare and splice"""
+        if isinstance(hist.index, pd.DatetimeIndex) and hist.index.tz is not None:
+            hist = hist.tz_localize(None)
+        return hist
+    
+    def save_history(self, symbol: str, hist: pd.DataFrame):
+        """Persist the history so the next cold start can skip the full download"""
+        try:
+            HISTORY_CACHE_DIR.mkdir(exist_ok=True)
+            hist.to_parquet(HISTORY_CACHE_DIR / f"{symbol}.parquet")
+        except (OSError, ImportError, ValueError):
+            pass
+    
+    def splice_history(self, symbol: str, cached: pd.DataFrame, recent: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Replace the tail of the cached history with freshly fetched bars; None if a full download is needed"""
+        if recent.empty:
+            return cached
+        # A cache older than the recent window would leave a gap
+        if recent.index[0] > cached.index[-1]:
+            return None
+        # Completed bars that changed mean Yahoo re-adjusted the history (split,
+        # dividend): the cache and the streamed state are on the old price scale
+        overlap = cached.index[:-1].intersection(recent.index)
+        if not np.allclose(cached.loc[overlap, 'Close'].to_numpy(dtype=np.float64),
+                           recent.loc[overlap, 'Close'].to_numpy(dtype=np.float64), rtol=1e-4):
+            with self._lock:
+                self.state.pop(symbol, None)
+            return None
+        hist = pd.concat([cached[cached.index < recent.index[0]], recent])
+        return hist[hist.index > hist.index[-1] - pd.DateOffset(months=3)]
+    
+    def update_state(self, symbol: str, hist: pd.DataFrame) -> Dict:
+        """Advance the symbol's indicator state and return current indicators; callers hold self._lock"""
+        state = self.state.get(symbol)
+        if state is None:
+            state = self.state[symbol] = IndicatorState()
+        
+        # The latest bar is still forming, so only completed bars are committed
+        completed = hist.iloc[:-1]
+        if state.last_timestamp is not None:
+            completed = completed[completed.index > state.last_timestamp]
+        if not completed.empty:
+            update_indicators(state, completed['Close'].to_numpy(), completed['Volume'].to_numpy())
+            state.last_timestamp = completed.index[-1]
+        
+        live = copy.deepcopy(state)
+        update_indicators(live, hist['Close'].to_numpy()[-1:], hist['Volume'].to_numpy()[-1:])
+        return build_indicators(state_values(live))
+
+_SIGNAL_TEMPLATE = """[Signal] {signal}
+[Asset] {asset}
+[Timeframe] {timeframe}
+[Contract Period] {contract_period}
+[Entry Zone] {entry_low:.2f} – {entry_high:.2f}
+[Target] {target_price:.2f}
+[Stop Loss] {stop_loss_price:.2f}
+[Confidence] {confidence}%
+[Reasoning] {reasoning}"""
 
 def format_structured_signal(signal: StructuredTradingSignal) -> str:
     """Format signal in the structured format"""
-    return f"""[Signal] {signal.signal}
-[Asset] {signal.asset}
-[Timeframe] {signal.timeframe}
-[Contract Period] {signal.contract_period}
-[Entry Zone] {signal.entry_zone}
-[Target] {signal.target}
-[Stop Loss] {signal.stop_loss}
-[Confidence] {signal.confidence}%
-[Reasoning] {signal.reasoning}"""
+    return _SIGNAL_TEMPLATE.format_map(signal.__dict__)
+
+def render_signals(trading_engine: EnhancedTradingEngine, data_manager: EnhancedDataManager,
+                   all_selected: List[str], timeframe: str):
+    """Render the structured signal cards for the selected symbols"""
+    batch = data_manager.get_market_data_batch(all_selected)
+    
+    # Score every fetched symbol in one vectorized pass
+    fetched = {symbol: batch[symbol] for symbol in all_selected if batch.get(symbol)}
+    signals = trading_engine.generate_structured_signals(fetched, timeframe)
+    
+    # Report fetch failures once instead of per symbol
+    failed = [symbol for symbol in all_selected if symbol not in fetched]
+    if failed:
+        st.error(f"Unable to fetch data for {', '.join(failed)}")
+    
+    for symbol, market_data in fetched.items():
+        with st.expander(f"📊 {symbol} - Structured Trading Signal", expanded=True):
+            signal = signals[symbol]
+            
+            # Display in two columns
+            col1, col2 = st.columns([2, 1])
+            
+            with col1:
+                st.markdown("#### 📋 Structured Signal Output")
+                st.code(format_structured_signal(signal), language="text")
+            
+            with col2:
+                st.markdown("#### 📊 Quick Metrics")
+                
+                # Signal badge
+                if signal.signal == 'BUY':
+                    st.success(f"🟢 {signal.signal}")
+                elif signal.signal == 'SELL':
+                    st.error(f"🔴 {signal.signal}")
+                else:
+                    st.warning(f"🟡 {signal.signal}")
+                
+                # Confidence meter
+                st.metric("Confidence", f"{signal.confidence}%")
+                
+                # Current price
+                st.metric("Current Price", f"${market_data['current_price']:.2f}", 
+                        f"{market_data['change_percent']:+.2f}%")
+                
+                # Timeframe and period
+                st.info(f"⏱️ {signal.timeframe} | {signal.contract_period}")
+
+# Initialize components once; reruns keep the streamed indicator state
+@st.cache_resource
+def get_trading_engine():
+    return EnhancedTradingEngine()
+
+@st.cache_resource
+def get_data_manager():
+    return EnhancedDataManager()
 
 def main():
     st.title("🚀 MamoraBot7 - Enhanced Trading AI")
     st.markdown("### Professional Trading Signals with Structured Format")
     
     # Initialize components
-    trading_engine = EnhancedTradingEngine()
-    data_manager = EnhancedDataManager()
+    trading_engine = get_trading_engine()
+    data_manager = get_data_manager()
     
     # Sidebar configuration
     st.sidebar.header("⚙️ Configuration")
@@ -359,50 +841,14 @@ def main():
     
     # Generate signals button
     if st.button("🎯 Generate Structured Trading Signals", type="primary"):
+        st.session_state['signals_requested'] = True
+    
+    if st.session_state.get('signals_requested'):
         st.markdown("---")
         
-        for symbol in all_selected:
-            with st.expander(f"📊 {symbol} - Structured Trading Signal", expanded=True):
-                market_data = data_manager.get_market_data(symbol)
-                
-                if market_data:
-                    # Generate structured signal
-                    signal = trading_engine.generate_structured_signal(symbol, market_data, timeframe)
-                    
-                    # Display in two columns
-                    col1, col2 = st.columns([2, 1])
-                    
-                    with col1:
-                        st.markdown("#### 📋 Structured Signal Output")
-                        st.code(format_structured_signal(signal), language="text")
-                    
-                    with col2:
-                        st.markdown("#### 📊 Quick Metrics")
-                        
-                        # Signal badge
-                        if signal.signal == 'BUY':
-                            st.success(f"🟢 {signal.signal}")
-                        elif signal.signal == 'SELL':
-                            st.error(f"🔴 {signal.signal}")
-                        else:
-                            st.warning(f"🟡 {signal.signal}")
-                        
-                        # Confidence meter
-                        st.metric("Confidence", f"{signal.confidence}%")
-                        
-                        # Current price
-                        st.metric("Current Price", f"${market_data['current_price']:.2f}", 
-                                f"{market_data['change_percent']:+.2f}%")
-                        
-                        # Timeframe and period
-                        st.info(f"⏱️ {signal.timeframe} | {signal.contract_period}")
-                else:
-                    st.error(f"Unable to fetch data for {symbol}")
-    
-    # Auto-refresh mechanism
-    if auto_refresh:
-        time.sleep(1)
-        st.rerun()
+        # Auto-refresh reruns only the signal cards, not the whole page
+        run_every = refresh_interval if auto_refresh else None
+        st.fragment(render_signals, run_every=run_every)(trading_engine, data_manager, all_selected, timeframe)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,317 @@
+"""Numba kernel for the TechnicalAnalyzer indicators in main.py.
+
+``calc_all`` computes every last-bar indicator in a single pass over the
+close/high/low arrays. Without numba installed it is the SciPy version, which
+runs the same recurrences as ``lfilter`` passes.
+"""
+import numpy as np
+
+try:
+    from numba import njit as _numba_njit
+except ImportError:
+    _numba_njit = None
+
+NUMBA_AVAILABLE = _numba_njit is not None
+
+
+def _njit(*args, **kwargs):
+    """numba.njit when numba is installed, otherwise a pass-through decorator"""
+    if _numba_njit is not None:
+        return _numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]):
+        return args[0]
+    return lambda func: func
+
+
+# Layout of the array returned by calc_all
+FIELDS = (
+    'sma_20', 'sma_50', 'ema_12', 'ema_26', 'rsi',
+    'bb_middle', 'bb_upper', 'bb_lower',
+    'atr', 'adx', 'macd', 'macd_signal',
+    'stoch_k', 'stoch_d', 'stoch_k_prev', 'stoch_d_prev',
+)
+N_FIELDS = len(FIELDS)
+
+
+@_njit(cache=True)
+def _stoch_k(close, high, low, i, period):
+    """%K at bar i; 50 while the lookback is incomplete or the range is flat"""
+    if i < period - 1:
+        return 50.0
+    lo = low[i]
+    hi = high[i]
+    for j in range(i - period + 1, i):
+        if low[j] < lo:
+            lo = low[j]
+        if high[j] > hi:
+            hi = high[j]
+    if hi == lo:
+        return 50.0
+    return (close[i] - lo) / (hi - lo) * 100.0
+
+
+# Single pass over the bars; NaN where the history is too short
+@_njit(cache=True, fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'})
+def _calc_all_nb(close, high, low):
+    """Last-bar values of every indicator, laid out as FIELDS"""
+    n = close.shape[0]
+    out = np.full(N_FIELDS, np.nan)
+    if n == 0:
+        return out
+
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a9 = 2.0 / 10.0
+    w = 1.0 / 14.0
+
+    # Recurrences seeded at the first bar, i.e. pandas ewm(adjust=False)
+    ema12 = close[0]
+    ema26 = close[0]
+    signal = 0.0
+    atr = high[0] - low[0]
+    plus_dm_avg = 0.0
+    minus_dm_avg = 0.0
+    roll_up = np.nan
+    roll_down = np.nan
+    adx = 0.0 if atr != 0.0 else np.nan
+
+    for i in range(1, n):
+        x = close[i]
+        ema12 = a12 * x + (1.0 - a12) * ema12
+        ema26 = a26 * x + (1.0 - a26) * ema26
+        signal = a9 * (ema12 - ema26) + (1.0 - a9) * signal
+
+        # Wilder RSI over the deltas, seeded at the first delta
+        delta = x - close[i - 1]
+        up = delta if delta > 0.0 else 0.0
+        down = -delta if delta < 0.0 else 0.0
+        if i == 1:
+            roll_up = up
+            roll_down = down
+        else:
+            roll_up = w * up + (1.0 - w) * roll_up
+            roll_down = w * down + (1.0 - w) * roll_down
+
+        # True range / ATR
+        tr = high[i] - low[i]
+        hc = abs(high[i] - close[i - 1])
+        lc = abs(low[i] - close[i - 1])
+        if hc > tr:
+            tr = hc
+        if lc > tr:
+            tr = lc
+        atr = w * tr + (1.0 - w) * atr
+
+        # Directional movement / ADX
+        up_move = high[i] - high[i - 1]
+        down_move = low[i - 1] - low[i]
+        plus_dm = up_move if (up_move > down_move and up_move > 0.0) else 0.0
+        minus_dm = down_move if (down_move > up_move and down_move > 0.0) else 0.0
+        plus_dm_avg = w * plus_dm + (1.0 - w) * plus_dm_avg
+        minus_dm_avg = w * minus_dm + (1.0 - w) * minus_dm_avg
+        # DX is undefined (NaN) while ATR is still 0, e.g. a history opening flat
+        if atr != 0.0:
+            plus_di = 100.0 * plus_dm_avg / atr
+            minus_di = 100.0 * minus_dm_avg / atr
+            di_sum = plus_di + minus_di
+            if di_sum == 0.0:
+                di_sum = 1e-9
+            dx = abs(plus_di - minus_di) / di_sum * 100.0
+        else:
+            dx = np.nan
+        # ADX starts at the first defined DX, as pandas ewm does
+        if np.isnan(adx):
+            adx = dx
+        else:
+            adx = w * dx + (1.0 - w) * adx
+
+    if n >= 20:
+        total = 0.0
+        for i in range(n - 20, n):
+            total += close[i]
+        mean = total / 20.0
+        sq = 0.0
+        for i in range(n - 20, n):
+            sq += (close[i] - mean) ** 2
+        bb_std = np.sqrt(sq / 20.0)
+        out[0] = mean
+        out[5] = mean
+        out[6] = mean + 2.0 * bb_std
+        out[7] = mean - 2.0 * bb_std
+    if n >= 50:
+        total = 0.0
+        for i in range(n - 50, n):
+            total += close[i]
+        out[1] = total / 50.0
+
+    out[2] = ema12
+    out[3] = ema26
+    if n > 1:
+        rs = roll_up / (roll_down if roll_down != 0.0 else 1e-9)
+        out[4] = 100.0 - 100.0 / (1.0 + rs)
+    out[8] = atr
+    out[9] = adx
+    out[10] = ema12 - ema26
+    out[11] = signal
+
+    # Stochastic %K and its 3-bar %D for the last two bars
+    k = np.empty(4)
+    for j in range(4):
+        i = n - 4 + j
+        k[j] = _stoch_k(close, high, low, i, 14) if i >= 0 else 50.0
+    out[12] = k[3]
+    out[13] = (k[1] + k[2] + k[3]) / 3.0 if n >= 3 else 50.0
+    out[14] = k[2] if n >= 2 else np.nan
+    out[15] = (k[0] + k[1] + k[2]) / 3.0 if n >= 4 else 50.0
+
+    return out
+
+
+# Column layout of the matrices scored by score_signals
+SIGNAL_KEYS = (
+    'rsi', 'macd', 'macd_signal', 'sma_20', 'sma_50', 'bb_lower', 'bb_upper',
+    'ema_12', 'ema_26', 'adx', 'macd_hist', 'stoch_cross_up', 'stoch_cross_dn',
+)
+# score_signals codes, indexed by the returned int8
+SIGNAL_CODES = ('BUY', 'SELL', 'HOLD')
+
+
+@_njit(cache=True)
+def score_signals(market, po, price, po_price):
+    """BUY/SELL/HOLD codes and confidences for (N, len(SIGNAL_KEYS)) indicator matrices"""
+    n = market.shape[0]
+    codes = np.empty(n, dtype=np.int8)
+    confidence = np.empty(n, dtype=np.float32)
+    for i in range(n):
+        rsi, macd, macd_signal = market[i, 0], market[i, 1], market[i, 2]
+        sma_20, sma_50, bb_lower, bb_upper = market[i, 3], market[i, 4], market[i, 5], market[i, 6]
+        ema_12, ema_26, adx, macd_hist = market[i, 7], market[i, 8], market[i, 9], market[i, 10]
+        p = price[i]
+
+        # Trend + momentum filters, stochastic confirmation
+        score = 0.0
+        if ema_12 > ema_26 and adx >= 20 and macd_hist > 0 and rsi > 50:
+            score += 0.6
+            if market[i, 11] != 0:
+                score += 0.15
+        if ema_12 < ema_26 and adx >= 20 and macd_hist < 0 and rsi < 50:
+            score += 0.6
+            if market[i, 12] != 0:
+                score += 0.15
+
+        # Price diff penalty
+        price_diff = abs(p - po_price[i]) / max(p, 1e-9)
+        score *= max(0.1, 1.0 - price_diff * 8)
+        base_confidence = min(max(score, 0.1), 0.99)
+
+        # RSI, MACD, moving average and Bollinger Band votes
+        strength = 0.0
+        count = 0
+        if rsi < 30 and po[i, 0] < 35:
+            strength += 1.0
+            count += 1
+        elif rsi > 70 and po[i, 0] > 65:
+            strength -= 1.0
+            count += 1
+        if macd > macd_signal and po[i, 1] > po[i, 2]:
+            strength += 1.0
+            count += 1
+        elif macd < macd_signal and po[i, 1] < po[i, 2]:
+            strength -= 1.0
+            count += 1
+        if p > sma_20 and p > sma_50:
+            strength += 0.5
+            count += 1
+        elif p < sma_20 and p < sma_50:
+            strength -= 0.5
+            count += 1
+        if p < bb_lower:
+            strength += 0.5
+            count += 1
+        elif p > bb_upper:
+            strength -= 0.5
+            count += 1
+
+        if count > 0:
+            avg_signal = strength / count
+            confidence[i] = base_confidence * min(1.0, abs(avg_signal))
+            codes[i] = 0 if avg_signal > 0.3 else (1 if avg_signal < -0.3 else 2)
+        else:
+            confidence[i] = 0.5
+            codes[i] = 2
+    return codes, confidence
+
+
+def _ewm(x, alpha):
+    """ewm(alpha=alpha, adjust=False) series, seeded at the first sample"""
+    # Fallback only
+    from scipy.signal import lfilter
+    y, _ = lfilter([alpha], [1.0, alpha - 1.0], x, zi=(1.0 - alpha) * x[:1])
+    return y
+
+
+def _calc_all_scipy(close, high, low):
+    """NumPy/SciPy implementation of _calc_all_nb for installs without numba"""
+    n = close.shape[0]
+    out = np.full(N_FIELDS, np.nan)
+    if n == 0:
+        return out
+    w = 1.0 / 14.0
+
+    ema12 = _ewm(close, 2.0 / 13.0)
+    ema26 = _ewm(close, 2.0 / 27.0)
+    macd = ema12 - ema26
+
+    prev_close = close[:-1]
+    tr = high - low
+    tr[1:] = np.maximum.reduce([tr[1:], np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)])
+    atr = _ewm(tr, w)
+
+    up_move = np.diff(high, prepend=high[0])
+    down_move = -np.diff(low, prepend=low[0])
+    plus_dm = np.where((up_move > down_move) & (up_move > 0.0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0.0), down_move, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = 100.0 * _ewm(plus_dm, w) / atr
+        minus_di = 100.0 * _ewm(minus_dm, w) / atr
+        di_sum = plus_di + minus_di
+        dx = np.abs(plus_di - minus_di) / np.where(di_sum == 0.0, 1e-9, di_sum) * 100.0
+    # ADX starts at the first defined DX, as in the kernel
+    valid = np.flatnonzero(~np.isnan(dx))
+    if valid.size:
+        out[9] = _ewm(dx[valid[0]:], w)[-1]
+
+    if n >= 20:
+        tail = close[-20:]
+        mean = tail.mean()
+        bb_std = tail.std()
+        out[0] = out[5] = mean
+        out[6] = mean + 2.0 * bb_std
+        out[7] = mean - 2.0 * bb_std
+    if n >= 50:
+        out[1] = close[-50:].mean()
+
+    out[2] = ema12[-1]
+    out[3] = ema26[-1]
+    if n > 1:
+        delta = np.diff(close)
+        roll_up = _ewm(np.maximum(delta, 0.0), w)[-1]
+        roll_down = _ewm(np.maximum(-delta, 0.0), w)[-1]
+        rs = roll_up / (roll_down if roll_down != 0.0 else 1e-9)
+        out[4] = 100.0 - 100.0 / (1.0 + rs)
+    out[8] = atr[-1]
+    out[10] = macd[-1]
+    out[11] = _ewm(macd, 0.2)[-1]
+
+    # Stochastic %K and its 3-bar %D for the last two bars
+    k = np.array([_stoch_k(close, high, low, i, 14) if i >= 0 else 50.0
+                  for i in range(n - 4, n)])
+    out[12] = k[3]
+    out[13] = k[1:].mean() if n >= 3 else 50.0
+    out[14] = k[2] if n >= 2 else np.nan
+    out[15] = k[:3].mean() if n >= 4 else 50.0
+
+    return out
+
+
+calc_all = _calc_all_nb if NUMBA_AVAILABLE else _calc_all_scipy
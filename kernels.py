@@ -0,0 +1,107 @@
+"""Indicator kernel shared by the numba JIT build and the AOT build (build_kernels.py).
+
+Written in the numba-compatible subset of Python so the same source can be
+passed to ``numba.njit`` or exported through ``numba.pycc``.
+"""
+import numpy as np
+
+# Bars that can influence the latest indicator values: SMA50 plus ~4 spans
+# of EMA26 warm-up
+INDICATOR_WINDOW = 4 * 26
+
+def compute_indicators(close, volume, sma20_n=20, sma50_n=50, rsi_n=14, bb_n=20,
+                       window=INDICATOR_WINDOW):
+    """Compute the latest SMA/EMA/MACD/RSI/Bollinger/volume values in one pass"""
+    n = close.shape[0]
+    start = max(0, n - max(sma50_n + 1, window))
+    
+    sma20 = np.nan
+    sma50 = np.nan
+    bb_middle = np.nan
+    bb_upper = np.nan
+    bb_lower = np.nan
+    rsi = np.nan
+    volume_avg = np.nan
+    volume_current = np.nan
+    ema12 = np.nan
+    ema26 = np.nan
+    macd_signal = np.nan
+    if n == 0:
+        return (sma20, sma50, ema12, ema26, macd_signal, rsi,
+                bb_middle, bb_upper, bb_lower, volume_avg, volume_current)
+    
+    alpha12 = 2.0 / 13.0
+    alpha26 = 2.0 / 27.0
+    alpha9 = 2.0 / 10.0
+    ema12 = close[start]
+    ema26 = close[start]
+    macd_signal = 0.0
+    sum20 = 0.0
+    sum50 = 0.0
+    vol_sum = 0.0
+    bb_count = 0
+    bb_mean = 0.0
+    bb_m2 = 0.0
+    gain_sum = 0.0
+    loss_sum = 0.0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    n_deltas = 0
+    
+    for i in range(start, n):
+        x = close[i]
+        
+        # EMA recurrences
+        if i > start:
+            ema12 = alpha12 * x + (1.0 - alpha12) * ema12
+            ema26 = alpha26 * x + (1.0 - alpha26) * ema26
+            macd_signal = alpha9 * (ema12 - ema26) + (1.0 - alpha9) * macd_signal
+            
+            # Wilder RSI, seeded with the simple average of the first deltas
+            delta = x - close[i - 1]
+            gain = delta if delta > 0.0 else 0.0
+            loss = -delta if delta < 0.0 else 0.0
+            n_deltas += 1
+            if n_deltas <= rsi_n:
+                gain_sum += gain
+                loss_sum += loss
+                if n_deltas == rsi_n:
+                    avg_gain = gain_sum / rsi_n
+                    avg_loss = loss_sum / rsi_n
+            else:
+                avg_gain = (avg_gain * (rsi_n - 1) + gain) / rsi_n
+                avg_loss = (avg_loss * (rsi_n - 1) + loss) / rsi_n
+        
+        # Running sums over the SMA windows
+        if i >= n - sma50_n:
+            sum50 += x
+        if i >= n - sma20_n:
+            sum20 += x
+            vol_sum += volume[i]
+        
+        # Welford accumulation over the Bollinger window
+        if i >= n - bb_n:
+            bb_count += 1
+            d = x - bb_mean
+            bb_mean += d / bb_count
+            bb_m2 += d * (x - bb_mean)
+    
+    if n >= sma20_n:
+        sma20 = sum20 / sma20_n
+        volume_avg = vol_sum / sma20_n
+    if n >= sma50_n:
+        sma50 = sum50 / sma50_n
+    if n >= bb_n and bb_n > 1:
+        bb_std = np.sqrt(bb_m2 / (bb_n - 1))
+        bb_middle = bb_mean
+        bb_upper = bb_mean + 2.0 * bb_std
+        bb_lower = bb_mean - 2.0 * bb_std
+    if n_deltas >= rsi_n:
+        if avg_loss == 0.0:
+            rsi = 100.0
+        else:
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    volume_current = volume[n - 1]
+    
+    return (sma20, sma50, ema12, ema26, macd_signal, rsi,
+            bb_middle, bb_upper, bb_lower, volume_avg, volume_current)
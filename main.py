@@ -6,13 +6,21 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import threading
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
+import os
 from datetime import timezone
 
+from indicators_nb import FIELDS, SIGNAL_CODES, SIGNAL_KEYS, calc_all, score_signals
+
+# Shared generator for the Pocket Option simulation; set PO_SIM_SEED for reproducible runs
+_seed = os.environ.get("PO_SIM_SEED")
+RNG = np.random.default_rng(int(_seed) if _seed else None)
+
 def seconds_to_next_candle(tf_seconds=60):
     now = datetime.now(timezone.utc)
     epoch = int(now.timestamp())
@@ -47,87 +55,109 @@ class MarketData:
     indicators: Dict
     timestamp: datetime
 
+@dataclass
+class MarketFrame:
+    """Market data for several symbols as parallel arrays, one row per symbol"""
+    symbols: List[str]
+    prices: np.ndarray          # (N,)
+    change_percent: np.ndarray  # (N,)
+    volumes: np.ndarray         # (N,)
+    indicators: np.ndarray      # (N, len(SIGNAL_KEYS))
+    
+    @classmethod
+    def from_market_data(cls, symbols: List[str], market_data_list: List[Dict]) -> 'MarketFrame':
+        """Stack DataManager market data dicts in a single pass"""
+        n = len(symbols)
+        prices = np.empty(n)
+        change_percent = np.empty(n)
+        volumes = np.empty(n)
+        indicators = np.empty((n, len(SIGNAL_KEYS)))
+        for i, md in enumerate(market_data_list):
+            prices[i] = md['price']
+            change_percent[i] = md['change_percent']
+            volumes[i] = md['volume']
+            ind = md['indicators']
+            indicators[i] = [float(ind.get(key, 0.0)) for key in SIGNAL_KEYS]
+        return cls(list(symbols), prices, change_percent, volumes, indicators)
+    
+    def indicator(self, key: str) -> np.ndarray:
+        """One indicator column across all symbols"""
+        return self.indicators[:, SIGNAL_KEYS.index(key)]
+    
+    def indicator_dict(self, i: int) -> Dict:
+        """Indicators of row i as a dict, for display"""
+        return dict(zip(SIGNAL_KEYS, self.indicators[i].tolist()))
+
 class PocketOptionSimulator:
     """Simulates Pocket Option data with slight variations from market data"""
     
     @staticmethod
-    def get_pocket_option_price(market_price: float) -> float:
-        # Simulate Pocket Option pricing with slight variations
-        variation = np.random.uniform(-0.02, 0.02)  # ±2% variation
-        return market_price * (1 + variation)
+    def get_pocket_option_price(market_price):
+        # Simulate Pocket Option pricing with slight variations; accepts a
+        # scalar or an array of prices (one draw per element)
+        variation = RNG.uniform(-0.02, 0.02, size=np.shape(market_price))  # ±2% variation
+        po_price = market_price * (1 + variation)
+        return float(po_price) if np.ndim(po_price) == 0 else po_price
     
     @staticmethod
     def get_pocket_option_indicators(market_indicators: Dict) -> Dict:
-        # Simulate Pocket Option indicators with variations
-        po_indicators = {}
-        for key, value in market_indicators.items():
-            if isinstance(value, (int, float)):
-                variation = np.random.uniform(-0.05, 0.05)  # ±5% variation
-                po_indicators[key] = value * (1 + variation)
-            else:
-                po_indicators[key] = value
+        # Simulate Pocket Option indicators with variations, one draw for all numeric keys
+        keys = [k for k, v in market_indicators.items() if isinstance(v, (int, float))]
+        values = np.fromiter((market_indicators[k] for k in keys), dtype=np.float64, count=len(keys))
+        values *= 1 + RNG.uniform(-0.05, 0.05, size=values.size)  # ±5% variation
+        po_indicators = dict(market_indicators)
+        po_indicators.update(zip(keys, values.tolist()))
         return po_indicators
+    
+    @staticmethod
+    def get_pocket_option_frame(market: MarketFrame) -> MarketFrame:
+        # Simulate Pocket Option prices and indicators for every symbol in two draws
+        variation = RNG.uniform(-0.05, 0.05, size=market.indicators.shape)  # ±5% variation
+        return MarketFrame(
+            symbols=market.symbols,
+            prices=PocketOptionSimulator.get_pocket_option_price(market.prices),
+            change_percent=market.change_percent,
+            volumes=market.volumes,
+            indicators=market.indicators * (1 + variation),
+        )
 
 class TechnicalAnalyzer:
     """Advanced technical analysis with dual source comparison"""
     
     @staticmethod
-    def calculate_indicators(df: pd.DataFrame) -> Dict:
-        """Calculate technical indicators (محسّنة)"""
-        indicators = {}
-    
-        # Moving Averages
-        indicators['sma_20'] = df['Close'].rolling(window=20).mean().iloc[-1]
-        indicators['sma_50'] = df['Close'].rolling(window=50).mean().iloc[-1]
-        indicators['ema_12'] = df['Close'].ewm(span=12, adjust=False).mean().iloc[-1]
-        indicators['ema_26'] = df['Close'].ewm(span=26, adjust=False).mean().iloc[-1]
-    
-        # RSI Wilder
-        delta = df['Close'].diff()
-        up = delta.clip(lower=0)
-        down = -delta.clip(upper=0)
-        roll_up = up.ewm(alpha=1/14, adjust=False).mean()
-        roll_down = down.ewm(alpha=1/14, adjust=False).mean()
-        rs = roll_up / roll_down.replace(0, 1e-9)
-        indicators['rsi'] = (100 - (100 / (1 + rs))).iloc[-1]
-    
-        # ATR
-        hl = df['High'] - df['Low']
-        hc = (df['High'] - df['Close'].shift()).abs()
-        lc = (df['Low'] - df['Close'].shift()).abs()
-        tr = pd.concat([hl, hc, lc], axis=1).max(axis=1)
-        indicators['atr'] = tr.ewm(alpha=1/14, adjust=False).mean().iloc[-1]
-    
-        # ADX
-        up_move = df['High'].diff()
-        down_move = -df['Low'].diff()
-        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
-        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
-        atr_ = tr.ewm(alpha=1/14, adjust=False).mean()
-        plus_di = 100 * pd.Series(plus_dm, index=df.index).ewm(alpha=1/14, adjust=False).mean() / atr_
-        minus_di = 100 * pd.Series(minus_dm, index=df.index).ewm(alpha=1/14, adjust=False).mean() / atr_
-        dx = (abs(plus_di - minus_di) / (plus_di + minus_di).replace(0, 1e-9)) * 100
-        indicators['adx'] = dx.ewm(alpha=1/14, adjust=False).mean().iloc[-1]
-    
-        # MACD
-        ema12 = df['Close'].ewm(span=12, adjust=False).mean()
-        ema26 = df['Close'].ewm(span=26, adjust=False).mean()
-        macd_line = ema12 - ema26
-        signal_line = macd_line.ewm(span=9, adjust=False).mean()
-        indicators['macd_hist'] = (macd_line - signal_line).iloc[-1]
-    
-        # Stochastic Oscillator
-        low_14 = df['Low'].rolling(window=14).min()
-        high_14 = df['High'].rolling(window=14).max()
-        k = ((df['Close'] - low_14) / (high_14 - low_14) * 100).fillna(50)
-        d = k.rolling(3).mean().fillna(50)
-        indicators['stoch_k'] = k.iloc[-1]
-        indicators['stoch_d'] = d.iloc[-1]
-        indicators['stoch_cross_up'] = (k.iloc[-2] < d.iloc[-2]) and (k.iloc[-1] > d.iloc[-1])
-        indicators['stoch_cross_dn'] = (k.iloc[-2] > d.iloc[-2]) and (k.iloc[-1] < d.iloc[-1])
-    
-        return indicators
+    def calculate_indicators(close: np.ndarray, high: np.ndarray, low: np.ndarray) -> Dict:
+        """Calculate technical indicators (محسّنة) from float64 close/high/low arrays"""
+        return _indicators_cached(close.tobytes(), high.tobytes(), low.tobytes())
 
+@st.cache_data(ttl=30, max_entries=128, show_spinner=False)
+def _indicators_cached(close_bytes: bytes, high_bytes: bytes, low_bytes: bytes) -> Dict:
+    """Indicators for one history, keyed on the raw float64 bytes of its columns"""
+    values = calc_all(
+        np.frombuffer(close_bytes, dtype=np.float64),
+        np.frombuffer(high_bytes, dtype=np.float64),
+        np.frombuffer(low_bytes, dtype=np.float64),
+    )
+    out = dict(zip(FIELDS, values.tolist()))
+
+    indicators = {key: out[key] for key in (
+        'sma_20', 'sma_50', 'ema_12', 'ema_26', 'rsi',
+        'bb_middle', 'bb_upper', 'bb_lower', 'atr', 'adx',
+    )}
+
+    # MACD: signal line is the 9-span EWM of the MACD series
+    indicators['macd'] = out['macd']
+    indicators['macd_signal'] = out['macd_signal']
+    indicators['macd_hist'] = out['macd'] - out['macd_signal']
+
+    # Stochastic Oscillator
+    k, d = out['stoch_k'], out['stoch_d']
+    k_prev, d_prev = out['stoch_k_prev'], out['stoch_d_prev']
+    indicators['stoch_k'] = k
+    indicators['stoch_d'] = d
+    indicators['stoch_cross_up'] = (k_prev < d_prev) and (k > d)
+    indicators['stoch_cross_dn'] = (k_prev > d_prev) and (k < d)
+
+    return indicators
 
 class SmartTradingEngine:
     """Intelligent trading signal generator with dual source analysis"""
@@ -138,117 +168,65 @@ class SmartTradingEngine:
         
     def generate_smart_signal(self, symbol: str, market_data: Dict, pocket_option_data: Dict) -> TradingSignal:
         """Generate intelligent trading signals considering both data sources"""
+        market = MarketFrame.from_market_data([symbol], [market_data])
+        po = MarketFrame.from_market_data([symbol], [{**market_data, **pocket_option_data}])
+        return self.generate_smart_signals(market, po)[0]
+    
+    def generate_smart_signals(self, market: MarketFrame, po: MarketFrame) -> List[TradingSignal]:
+        """Score every symbol in one compiled pass over the stacked indicators"""
+        codes, confidence = score_signals(market.indicators, po.indicators, market.prices, po.prices)
         
+        now = datetime.now()
+        return [
+            TradingSignal(
+                symbol=symbol,
+                signal_type=SIGNAL_CODES[codes[i]],
+                confidence=float(confidence[i]),
+                pocket_option_value=float(po.prices[i]),
+                market_value=float(market.prices[i]),
+                timestamp=now,
+                indicators={
+                    'market': market.indicator_dict(i),
+                    'pocket_option': po.indicator_dict(i)
+                }
+            )
+            for i, symbol in enumerate(market.symbols)
+        ]
 
-        # Technical analysis signals
-        indicators = market_data['indicators']
-        po_indicators = pocket_option_data['indicators']
-        
-        signal_strength = 0
-        signal_count = 0
-        # ind = market_data['indicators']
-        # po_ind = pocket_option_data['indicators']
-        
-        # Trend + momentum filters
-        trend_up = (indicators['ema_12'] > indicators['ema_26']) and (indicators['adx'] >= 20)
-        trend_dn = (indicators['ema_12'] < indicators['ema_26']) and (indicators['adx'] >= 20)
-        
-        bull_momentum = (indicators['macd_hist'] > 0) and (indicators['rsi'] > 50)
-        bear_momentum = (indicators['macd_hist'] < 0) and (indicators['rsi'] < 50)
-        
-        # Stochastic confirmation
-        stoch_up = indicators.get('stoch_cross_up', False)
-        stoch_dn = indicators.get('stoch_cross_dn', False)
-        
-        signal_type = "HOLD"
-        score = 0.0
-        
-        if trend_up and bull_momentum:
-            score += 0.6
-            if stoch_up: score += 0.15
-        if trend_dn and bear_momentum:
-            score += 0.6
-            if stoch_dn: score += 0.15
-        
-        # Price diff penalty
-        price_diff = abs(market_data['price'] - pocket_option_data['price']) / max(market_data['price'], 1e-9)
-        score *= max(0.1, 1.0 - price_diff * 8)
+@st.cache_resource
+def get_http_session():
+    """Keep-alive HTTP session shared by every yfinance request"""
+    try:
+        # Recent yfinance releases talk to Yahoo through curl_cffi sessions
+        from curl_cffi import requests as curl_requests
+    except ImportError:
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16))
+        return session
+    return curl_requests.Session(impersonate="chrome")
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_history(symbol: str) -> pd.DataFrame:
+    """Download daily history; shared by every session within the TTL"""
+    ticker = yf.Ticker(symbol, session=get_http_session())
+    return ticker.history(period="3mo", interval="1d")
 
-        # Calculate confidence based on agreement between sources
-        # price_diff = abs(market_data['price'] - pocket_option_data['price']) / market_data['price']
-  
-        # Final decision
-        if score >= 0.65:
-            signal_type = "BUY" if trend_up else "SELL"
-        elif score >= 0.5:
-            signal_type = "HOLD"
-        else:
-            signal_type = "HOLD"
-        
-        base_confidence = float(np.clip(score, 0.1, 0.99))              
-        # base_confidence = max(0.1, 1.0 - (price_diff * 10))  # Lower confidence if prices diverge significantly
-        
-        # RSI signals
-        if indicators['rsi'] < 30 and po_indicators['rsi'] < 35:
-            signal_strength += 1  # Oversold - BUY signal
-            signal_count += 1
-        elif indicators['rsi'] > 70 and po_indicators['rsi'] > 65:
-            signal_strength -= 1  # Overbought - SELL signal
-            signal_count += 1
-            
-        # MACD signals
-        if indicators['macd'] > indicators['macd_signal'] and po_indicators['macd'] > po_indicators['macd_signal']:
-            signal_strength += 1
-            signal_count += 1
-        elif indicators['macd'] < indicators['macd_signal'] and po_indicators['macd'] < po_indicators['macd_signal']:
-            signal_strength -= 1
-            signal_count += 1
-            
-        # Moving Average signals
-        current_price = market_data['price']
-        if current_price > indicators['sma_20'] and current_price > indicators['sma_50']:
-            signal_strength += 0.5
-            signal_count += 1
-        elif current_price < indicators['sma_20'] and current_price < indicators['sma_50']:
-            signal_strength -= 0.5
-            signal_count += 1
-            
-        # Bollinger Bands signals
-        if current_price < indicators['bb_lower']:
-            signal_strength += 0.5  # Potential bounce
-            signal_count += 1
-        elif current_price > indicators['bb_upper']:
-            signal_strength -= 0.5  # Potential pullback
-            signal_count += 1
-            
-        # Determine signal type and confidence
-        if signal_count > 0:
-            avg_signal = signal_strength / signal_count
-            confidence = base_confidence * min(1.0, abs(avg_signal))
-            
-            if avg_signal > 0.3:
-                signal_type = "BUY"
-            elif avg_signal < -0.3:
-                signal_type = "SELL"
-            else:
-                signal_type = "HOLD"
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_histories(symbols: Tuple[str, ...]) -> Dict[str, pd.DataFrame]:
+    """Download daily history for several symbols in one threaded request"""
+    data = yf.download(list(symbols), period="3mo", interval="1d", group_by='ticker',
+                       threads=True, progress=False, auto_adjust=True,
+                       session=get_http_session())
+    histories = {}
+    for symbol in symbols:
+        if isinstance(data.columns, pd.MultiIndex):
+            if symbol not in data.columns.get_level_values(0):
+                continue
+            hist = data[symbol]
         else:
-            signal_type = "HOLD"
-            confidence = 0.5
-            
-        return TradingSignal(
-            symbol=symbol,
-            signal_type=signal_type,
-            confidence=confidence,
-            pocket_option_value=pocket_option_data['price'],
-            market_value=market_data['price'],
-            timestamp=datetime.now(),
-            indicators={
-                'market': indicators,
-                'pocket_option': po_indicators
-            }
-        )
+            hist = data
+        histories[symbol] = hist.dropna(subset=['Close'])
+    return histories
 
 class DataManager:
     """Manages data fetching and caching with auto-refresh"""
@@ -257,40 +235,82 @@ class DataManager:
         self.cache = {}
         self.last_update = {}
         self.update_interval = 30  # seconds
+        # Guards cache/last_update
+        self._lock = threading.Lock()
         
     def get_market_data(self, symbol: str) -> Optional[Dict]:
         """Fetch real-time market data"""
+        with self._lock:
+            if not self.should_update(symbol):
+                return self.cache[symbol]
+        
         try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="3mo", interval="1d")
-            
-            if hist.empty:
-                return None
-                
-            current_price = hist['Close'].iloc[-1]
-            volume = hist['Volume'].iloc[-1]
-            change_percent = ((current_price - hist['Close'].iloc[-2]) / hist['Close'].iloc[-2]) * 100
-            
-            # Calculate technical indicators
-            analyzer = TechnicalAnalyzer()
-            indicators = analyzer.calculate_indicators(hist)
-            
-            return {
-                'price': current_price,
-                'volume': volume,
-                'change_percent': change_percent,
-                'indicators': indicators,
-                'timestamp': datetime.now()
-            }
+            return self.build_market_data(symbol, _fetch_history(symbol))
         except Exception as e:
             st.error(f"Error fetching market data for {symbol}: {str(e)}")
             return None
     
+    def get_market_data_bulk(self, symbols: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch market data for all stale symbols with a single download"""
+        with self._lock:
+            stale = [symbol for symbol in symbols if self.should_update(symbol)]
+            cached = {symbol: self.cache[symbol] for symbol in symbols if symbol not in stale}
+        histories = {}
+        if stale:
+            try:
+                histories = _fetch_histories(tuple(stale))
+            except Exception as e:
+                st.error(f"Error fetching market data for {', '.join(stale)}: {str(e)}")
+        
+        results = {}
+        for symbol in symbols:
+            hist = histories.get(symbol)
+            if symbol in cached:
+                results[symbol] = cached[symbol]
+            elif hist is None or hist.empty:
+                # Fall back to a per-symbol request
+                results[symbol] = self.get_market_data(symbol)
+            else:
+                try:
+                    results[symbol] = self.build_market_data(symbol, hist)
+                except Exception as e:
+                    st.error(f"Error fetching market data for {symbol}: {str(e)}")
+                    results[symbol] = None
+        return results
+    
+    def build_market_data(self, symbol: str, hist: pd.DataFrame) -> Optional[Dict]:
+        """Summarize a history, calculate indicators and cache the result"""
+        if hist.empty:
+            return None
+            
+        close = hist['Close'].to_numpy(dtype=np.float64)
+        high = hist['High'].to_numpy(dtype=np.float64)
+        low = hist['Low'].to_numpy(dtype=np.float64)
+        
+        current_price = close[-1]
+        volume = hist['Volume'].to_numpy()[-1]
+        change_percent = (close[-1] / close[-2] - 1) * 100
+        
+        # Calculate technical indicators
+        indicators = TechnicalAnalyzer.calculate_indicators(close, high, low)
+        
+        result = {
+            'price': current_price,
+            'volume': volume,
+            'change_percent': change_percent,
+            'indicators': indicators,
+            'timestamp': datetime.now()
+        }
+        with self._lock:
+            self.cache[symbol] = result
+            self.last_update[symbol] = time.monotonic()
+        return result
+    
     def should_update(self, symbol: str) -> bool:
-        """Check if data should be updated"""
+        """Check if data should be updated; callers hold self._lock"""
         if symbol not in self.last_update:
             return True
-        return (datetime.now() - self.last_update[symbol]).seconds > self.update_interval
+        return time.monotonic() - self.last_update[symbol] > self.update_interval
 
 # Initialize components
 @st.cache_resource
@@ -301,6 +321,12 @@ def get_trading_engine():
 def get_data_manager():
     return DataManager()
 
+def _auto_refresh_tick():
+    """Fragment body: the first run happens with the page, later timer runs rerun the app"""
+    if st.session_state.get("_refresh_armed"):
+        st.rerun()
+    st.session_state["_refresh_armed"] = True
+
 def main():
     st.title("🚀 Advanced Trading AI Dashboard")
     st.markdown("### Intelligent Trading Signals with Dual Source Analysis")
@@ -355,6 +381,14 @@ def main():
         st.warning("Please select at least one trading symbol from the sidebar.")
         return
     
+    # Fetch each symbol once per rerun; every tab reads from this dict
+    market_data_by_symbol = data_manager.get_market_data_bulk(selected_symbols)
+    fetched_symbols = [s for s in selected_symbols if market_data_by_symbol[s]]
+    market = MarketFrame.from_market_data(fetched_symbols, [market_data_by_symbol[s] for s in fetched_symbols])
+    
+    # Simulate Pocket Option data once so all tabs show the same PO values
+    po = pocket_option_sim.get_pocket_option_frame(market)
+    
     # Create columns for layout
     col1, col2 = st.columns([2, 1])
     
@@ -369,27 +403,18 @@ def main():
             
             signals_container = st.container()
             
+            # Score all symbols in one batch
+            signals_by_symbol = dict(zip(market.symbols, trading_engine.generate_smart_signals(market, po)))
+            
             with signals_container:
                 for symbol in selected_symbols:
                     with st.expander(f"📈 {symbol} - Smart Trading Analysis", expanded=True):
                         col_a, col_b, col_c = st.columns(3)
                         
-                        # Fetch market data
-                        # market_data = data_manager.get_market_data(symbol)
-                        market_data = data_manager.fetch(symbol, interval=tf_map[timeframe], limit=200)
+                        market_data = market_data_by_symbol[symbol]
 
                         if market_data:
-                            # Generate Pocket Option simulation data
-                            po_price = pocket_option_sim.get_pocket_option_price(market_data['price'])
-                            po_indicators = pocket_option_sim.get_pocket_option_indicators(market_data['indicators'])
-                            
-                            pocket_option_data = {
-                                'price': po_price,
-                                'indicators': po_indicators
-                            }
-                            
-                            # Generate smart signal
-                            signal = trading_engine.generate_smart_signal(symbol, market_data, pocket_option_data)
+                            signal = signals_by_symbol[symbol]
                             
                             # Display signal
                             with col_a:
@@ -417,21 +442,19 @@ def main():
                             
                             # Additional signal details
                             st.markdown("**Signal Analysis:**")
-                            col_d, col_e = st.columns(2)
-                            
-                            with col_d:
-                                st.markdown("**Market Indicators:**")
-                                market_ind = signal.indicators['market']
-                                st.write(f"• RSI: {market_ind['rsi']:.1f}")
-                                st.write(f"• MACD: {market_ind['macd']:.4f}")
-                                st.write(f"• SMA(20): ${market_ind['sma_20']:.2f}")
-                            
-                            with col_e:
-                                st.markdown("**Pocket Option Indicators:**")
-                                po_ind = signal.indicators['pocket_option']
-                                st.write(f"• RSI: {po_ind['rsi']:.1f}")
-                                st.write(f"• MACD: {po_ind['macd']:.4f}")
-                                st.write(f"• SMA(20): ${po_ind['sma_20']:.2f}")
+                            market_ind = signal.indicators['market']
+                            po_ind = signal.indicators['pocket_option']
+                            ind_keys = ['rsi', 'macd', 'sma_20']
+                            ind_table = pd.DataFrame(
+                                np.array([[market_ind[k] for k in ind_keys], [po_ind[k] for k in ind_keys]],
+                                         dtype=np.float64),
+                                index=['Market', 'Pocket Option'],
+                                columns=['RSI', 'MACD', 'SMA(20)'],
+                            )
+                            # float32 is plenty for the oscillators; prices keep float64 cents
+                            ind_table = ind_table.astype({'RSI': np.float32, 'MACD': np.float32})
+                            st.table(ind_table.style.format(
+                                {'RSI': '{:.1f}', 'MACD': '{:.4f}', 'SMA(20)': '${:.2f}'}))
                         
                         else:
                             st.error(f"Unable to fetch data for {symbol}")
@@ -439,67 +462,62 @@ def main():
         with tab2:
             st.markdown("#### 💰 Price Comparison: Market vs Pocket Option")
             
-            for symbol in selected_symbols:
-                market_data = data_manager.get_market_data(symbol)
-                if market_data:
-                    po_price = pocket_option_sim.get_pocket_option_price(market_data['price'])
-                    
-                    # Create comparison chart
-                    fig = go.Figure()
-                    
-                    categories = ['Market Price', 'Pocket Option Price']
-                    values = [market_data['price'], po_price]
-                    colors = ['#1f77b4', '#ff7f0e']
-                    
-                    fig.add_trace(go.Bar(
-                        x=categories,
+            if market.symbols:
+                
+                # One grouped comparison chart for all symbols
+                fig = go.Figure([
+                    go.Bar(
+                        name=name,
+                        x=market.symbols,
                         y=values,
-                        marker_color=colors,
+                        marker_color=color,
                         text=[f"${v:.2f}" for v in values],
                         textposition='auto',
-                    ))
-                    
-                    fig.update_layout(
-                        title=f"{symbol} - Price Comparison",
-                        yaxis_title="Price ($)",
-                        height=300
                     )
-                    
-                    st.plotly_chart(fig, use_container_width=True)
+                    for name, values, color in (
+                        ('Market Price', market.prices, '#1f77b4'),
+                        ('Pocket Option Price', po.prices, '#ff7f0e'),
+                    )
+                ])
+                
+                fig.update_layout(
+                    barmode='group',
+                    title="Price Comparison",
+                    yaxis_title="Price ($)",
+                    height=400
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
         
         with tab3:
             st.markdown("#### 📈 Technical Indicators Comparison")
             
-            for symbol in selected_symbols:
-                market_data = data_manager.get_market_data(symbol)
-                if market_data:
-                    po_indicators = pocket_option_sim.get_pocket_option_indicators(market_data['indicators'])
-                    
-                    st.markdown(f"**{symbol} - Technical Analysis**")
-                    
-                    # Create comparison table
-                    comparison_data = {
-                        'Indicator': ['RSI', 'MACD', 'SMA(20)', 'SMA(50)', 'BB Upper', 'BB Lower'],
-                        'Market Value': [
-                            f"{market_data['indicators']['rsi']:.2f}",
-                            f"{market_data['indicators']['macd']:.4f}",
-                            f"${market_data['indicators']['sma_20']:.2f}",
-                            f"${market_data['indicators']['sma_50']:.2f}",
-                            f"${market_data['indicators']['bb_upper']:.2f}",
-                            f"${market_data['indicators']['bb_lower']:.2f}"
-                        ],
-                        'Pocket Option Value': [
-                            f"{po_indicators['rsi']:.2f}",
-                            f"{po_indicators['macd']:.4f}",
-                            f"${po_indicators['sma_20']:.2f}",
-                            f"${po_indicators['sma_50']:.2f}",
-                            f"${po_indicators['bb_upper']:.2f}",
-                            f"${po_indicators['bb_lower']:.2f}"
-                        ]
-                    }
-                    
-                    df_comparison = pd.DataFrame(comparison_data)
-                    st.dataframe(df_comparison, use_container_width=True)
+            # One stacked comparison table for every symbol, formatted by the Styler
+            indicator_rows = [
+                ('RSI', 'rsi', '{:.2f}'),
+                ('MACD', 'macd', '{:.4f}'),
+                ('SMA(20)', 'sma_20', '${:.2f}'),
+                ('SMA(50)', 'sma_50', '${:.2f}'),
+                ('BB Upper', 'bb_upper', '${:.2f}'),
+                ('BB Lower', 'bb_lower', '${:.2f}'),
+            ]
+            keys = [key for _, key, _ in indicator_rows]
+            columns = [SIGNAL_KEYS.index(key) for key in keys]
+            market_values = market.indicators[:, columns]
+            po_values = po.indicators[:, columns]
+            
+            df_comparison = pd.DataFrame({
+                'Symbol': np.repeat(market.symbols, len(keys)),
+                'Indicator': np.tile([name for name, _, _ in indicator_rows], len(market.symbols)),
+                'Market Value': market_values.ravel(),
+                'Pocket Option Value': po_values.ravel(),
+            })
+            value_columns = ['Market Value', 'Pocket Option Value']
+            styler = df_comparison.style.hide(axis='index')
+            for name, _, fmt in indicator_rows:
+                rows = df_comparison.index[df_comparison['Indicator'] == name]
+                styler = styler.format(fmt, subset=pd.IndexSlice[rows, value_columns])
+            st.dataframe(styler, use_container_width=True)
     
     with col2:
         st.subheader("📊 Dashboard Info")
@@ -529,10 +547,10 @@ def main():
         st.info("📊 All indicators are compared across both sources")
         st.info("🧠 AI engine learns from price discrepancies")
     
-    # Auto-refresh mechanism
+    # Auto-refresh mechanism: a timed fragment reruns the app every refresh_interval
     if auto_refresh:
-        time.sleep(1)  # Small delay for UI updates
-        st.rerun()
+        st.session_state["_refresh_armed"] = False
+        st.fragment(_auto_refresh_tick, run_every=refresh_interval)()
 
 if __name__ == "__main__":
     main()